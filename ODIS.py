@@ -1,20 +1,43 @@
 import streamlit as st
-from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict, deque
 
 class TablePlanner:
     def __init__(self):
-        # Tables: {table_id: {'capacity': capacity, 'occupied': bool, 'room': room_name}}
+        # Tables: {table_id: {'capacity': capacity, 'occupied': bool, 'combined': bool, 'room': room_name}}
         self.tables = {}
-        # Current assignments: {table_id: [group_ids]}
-        self.assignments = defaultdict(list)
+        # Table IDs kept in display order, with their labels in a parallel list for bisecting
+        self._sorted_table_ids = []
+        self._sorted_table_labels = []
+        # Physical tables not currently merged into a combined table
+        self.physical_table_ids = set()
+        # Seats across all physical tables (combined tables reuse their components' seats)
+        self.total_capacity = 0
+        # Current assignments: {table_id: {group_ids}}
+        self.assignments = {}
+        # Seated guests per table: {table_id: number of people}
+        self.table_occupancy = defaultdict(int)
         # Guest groups waiting to be seated: {group_id: {'size': size, 'name': name}}
         self.groups = {}
         # Seated groups: {group_id: {'size': size, 'name': name, 'table': table_id}}
         self.seated_groups = {}
+        # Display lists built from groups/seated_groups, rebuilt only after they change
+        self._groups_dirty = True
+        self._waiting_groups_cache = []
+        self._all_groups_cache = []
         # Counter for group IDs
         self.next_group_id = 1
-        # Combined tables tracking
+        # Combined tables tracking: {combined_id: [component table_ids]}
         self.combined_tables = {}
+        # Counter for combined table IDs (integers, so they never clash with named tables)
+        self.next_combined_id = 1
+        # Free tables per room, sorted by capacity: {room: [(capacity, table_id)]}
+        self.free_by_room = defaultdict(list)
+        # Largest free table and total free seats per room: {room: capacity}
+        self.max_free_by_room = defaultdict(int)
+        self.sum_free_by_room = defaultdict(int)
+        # Free tables per room by capacity: {room: Counter({capacity: count})}
+        self.free_capacities_by_room = defaultdict(Counter)
         # Room definitions
         self.rooms = {
             "GREENROOM": ["T1A", "T1B", "T2", "T3A", "T3B"],
@@ -22,15 +45,77 @@ class TablePlanner:
             "BOTTOM BAR": ["WINDOW", "BACK RIGHT", "LADS", "BLACKBOARD"],
             "SMALL FUNCTION": ["SQUARE", "OVAL", "WOODEN"]
         }
+        # Reverse room lookup: {table_id: room_name}
+        self.table_to_room = {table_id: room for room, table_ids in self.rooms.items() for table_id in table_ids}
 
     def add_table(self, table_id, capacity, room):
         """Add a new table to the pub"""
+        if room not in self.rooms:
+            raise ValueError(f"Unknown room: {room}")
+        if table_id in self.tables:
+            raise ValueError(f"Duplicate table: {table_id}")
         self.tables[table_id] = {'capacity': capacity, 'occupied': False, 'combined': False, 'room': room}
+        self._index_table(table_id)
+        self._add_to_display_order(table_id)
+
+    def bulk_add_tables(self, entries):
+        """Add several tables at once from (table_id, capacity, room) entries"""
+        entries = list(entries)
+        seen_table_ids = set()
+        for table_id, _, room in entries:
+            if room not in self.rooms:
+                raise ValueError(f"Unknown room: {room}")
+            if table_id in self.tables or table_id in seen_table_ids:
+                raise ValueError(f"Duplicate table: {table_id}")
+            seen_table_ids.add(table_id)
+        
+        self.tables.update({
+            table_id: {'capacity': capacity, 'occupied': False, 'combined': False, 'room': room}
+            for table_id, capacity, room in entries
+        })
+        touched_rooms = set()
+        for table_id, capacity, room in entries:
+            self.table_to_room[table_id] = room
+            self.physical_table_ids.add(table_id)
+            self.total_capacity += capacity
+            self.free_by_room[room].append((capacity, table_id))
+            self.free_capacities_by_room[room][capacity] += 1
+            self.sum_free_by_room[room] += capacity
+            touched_rooms.add(room)
+        for room in touched_rooms:
+            free_tables = self.free_by_room[room]
+            free_tables.sort()
+            self.max_free_by_room[room] = free_tables[-1][0]
+        
+        # Sort the display order once rather than bisecting in each table; physical tables are labelled by their ID
+        new_table_ids = [table_id for table_id, _, _ in entries]
+        display_order = sorted(
+            zip(self._sorted_table_labels + new_table_ids, self._sorted_table_ids + new_table_ids),
+            key=lambda entry: entry[0],
+        )
+        self._sorted_table_labels = [label for label, _ in display_order]
+        self._sorted_table_ids = [table_id for _, table_id in display_order]
+
+    def _index_table(self, table_id):
+        """Record a newly added physical table in the room, capacity and free-table indexes"""
+        table_info = self.tables[table_id]
+        self.table_to_room[table_id] = table_info['room']
+        self.physical_table_ids.add(table_id)
+        self.total_capacity += table_info['capacity']
+        self._mark_table_free(table_id)
 
     def remove_table(self, table_id):
         """Remove a table from the pub"""
         if table_id in self.tables:
+            if table_id in self.combined_tables:
+                # Combined tables are never in the free index and share their components' seats
+                self._break_up_combined_table(table_id)
+            else:
+                self._mark_table_in_use(table_id)
+                self.total_capacity -= self.tables[table_id]['capacity']
             del self.tables[table_id]
+            self._remove_from_display_order(table_id)
+            self.physical_table_ids.discard(table_id)
             if table_id in self.assignments:
                 # Move any assigned groups back to waiting
                 for group_id in self.assignments[table_id]:
@@ -40,6 +125,30 @@ class TablePlanner:
                         self.groups[group_id] = {'size': group_data['size'], 'name': group_data['name']}
                         del self.seated_groups[group_id]
                 del self.assignments[table_id]
+                self._groups_dirty = True
+            self.table_occupancy.pop(table_id, None)
+
+    def _add_to_display_order(self, table_id):
+        """Insert a table into the display order by its label"""
+        label = self.get_table_label(table_id)
+        index = bisect_right(self._sorted_table_labels, label)
+        self._sorted_table_labels.insert(index, label)
+        self._sorted_table_ids.insert(index, table_id)
+
+    def _remove_from_display_order(self, table_id):
+        """Drop a table from the display order"""
+        index = self._sorted_table_ids.index(table_id)
+        del self._sorted_table_ids[index]
+        del self._sorted_table_labels[index]
+
+    def _break_up_combined_table(self, table_id):
+        """Release the component tables of a combined table and forget the combination"""
+        for comp_table in self.combined_tables.pop(table_id):
+            if comp_table in self.tables:
+                self.tables[comp_table]['occupied'] = False
+                self.tables[comp_table]['combined'] = False
+                self.physical_table_ids.add(comp_table)
+                self._mark_table_free(comp_table)
 
     def add_guests(self, group_size, group_name=None):
         """Add a new group of guests"""
@@ -51,8 +160,42 @@ class TablePlanner:
             group_name = f"Group {group_id}"
             
         self.groups[group_id] = {'size': group_size, 'name': group_name}
+        self._groups_dirty = True
         return group_id
 
+    def _mark_table_free(self, table_id):
+        """Add a table to its room's free-table index"""
+        table_info = self.tables[table_id]
+        room = table_info['room']
+        capacity = table_info['capacity']
+        free_tables = self.free_by_room[room]
+        entry = (capacity, table_id)
+        index = bisect_left(free_tables, entry)
+        if index == len(free_tables) or free_tables[index] != entry:
+            free_tables.insert(index, entry)
+            self.free_capacities_by_room[room][capacity] += 1
+            self.sum_free_by_room[room] += capacity
+            self.max_free_by_room[room] = free_tables[-1][0]
+
+    def _mark_table_in_use(self, table_id):
+        """Remove a table from its room's free-table index"""
+        table_info = self.tables[table_id]
+        room = table_info['room']
+        capacity = table_info['capacity']
+        free_tables = self.free_by_room.get(room)
+        if not free_tables:
+            return
+        entry = (capacity, table_id)
+        index = bisect_left(free_tables, entry)
+        if index < len(free_tables) and free_tables[index] == entry:
+            del free_tables[index]
+            free_capacities = self.free_capacities_by_room[room]
+            free_capacities[capacity] -= 1
+            if not free_capacities[capacity]:
+                del free_capacities[capacity]
+            self.sum_free_by_room[room] -= capacity
+            self.max_free_by_room[room] = free_tables[-1][0] if free_tables else 0
+
     def seat_guests(self, group_id, table_id):
         """Seat a specific group at a specific table"""
         if table_id not in self.tables:
@@ -64,31 +207,24 @@ class TablePlanner:
         group_size = self.groups[group_id]['size']
         group_name = self.groups[group_id]['name']
         table_info = self.tables[table_id]
-
-        # Check if table is part of a combined table
-        if table_info.get('combined', False) and '+' in table_id:
-            # This is a combined table, use its capacity
-            table_capacity = table_info['capacity']
-        else:
-            # Regular table
-            table_capacity = table_info['capacity']
+        # Combined tables carry the total capacity of their components
+        table_capacity = table_info['capacity']
 
         if group_size > table_capacity:
             return False, "Group too large for table"
 
         # Check if table is already occupied
-        if self.tables[table_id]['occupied']:
+        if table_info['occupied']:
             # Check if there's enough remaining capacity
-            current_occupancy = sum(
-                self.seated_groups[gid]['size'] for gid in self.assignments[table_id] 
-                if gid in self.seated_groups
-            )
+            current_occupancy = self.table_occupancy.get(table_id, 0)
             if current_occupancy + group_size > table_capacity:
                 return False, "Not enough space at table"
 
         # Seat the group
-        self.assignments[table_id].append(group_id)
-        self.tables[table_id]['occupied'] = True
+        self.assignments.setdefault(table_id, set()).add(group_id)
+        self.table_occupancy[table_id] += group_size
+        table_info['occupied'] = True
+        self._mark_table_in_use(table_id)
         
         # Move group from waiting to seated
         self.seated_groups[group_id] = {
@@ -97,6 +233,7 @@ class TablePlanner:
             'table': table_id
         }
         del self.groups[group_id]
+        self._groups_dirty = True
 
         return True, "Group seated successfully"
 
@@ -106,97 +243,118 @@ class TablePlanner:
             table_id = self.seated_groups[group_id]['table']
             
             # Remove group from table assignments
-            if table_id in self.assignments and group_id in self.assignments[table_id]:
-                self.assignments[table_id].remove(group_id)
+            if group_id in self.assignments.get(table_id, ()):
+                self.assignments[table_id].discard(group_id)
+                self.table_occupancy[table_id] -= self.seated_groups[group_id]['size']
+                if not self.table_occupancy[table_id]:
+                    del self.table_occupancy[table_id]
                 
                 # If no more groups at table, mark as unoccupied
                 if not self.assignments[table_id]:
                     self.tables[table_id]['occupied'] = False
                     
                     # If this is a combined table, break it apart
-                    if '+' in table_id and table_id in self.combined_tables:
-                        component_tables = self.combined_tables[table_id]
-                        for comp_table in component_tables:
-                            if comp_table in self.tables:
-                                self.tables[comp_table]['occupied'] = False
-                                self.tables[comp_table]['combined'] = False
+                    if table_id in self.combined_tables:
+                        self._break_up_combined_table(table_id)
                         # Remove the combined table
                         del self.tables[table_id]
-                        del self.combined_tables[table_id]
+                        self._remove_from_display_order(table_id)
                         del self.assignments[table_id]
+                    elif not self.tables[table_id]['combined']:
+                        self._mark_table_free(table_id)
             
             # Remove group from seated groups
             del self.seated_groups[group_id]
+            self._groups_dirty = True
             return True, f"Group marked as left"
         else:
             return False, "Group not found or not seated"
 
     def find_best_table_for_group(self, group_size, group_id):
         """Find the best table for a group, combining tables if necessary"""
-        # First try to find a single table that can accommodate the group
-        for table_id, table_info in self.tables.items():
-            # Skip combined tables and tables that are already part of a combination
-            if '+' in table_id or table_info.get('combined', False) or table_info['occupied']:
-                continue
-                
-            if group_size <= table_info['capacity']:
-                return table_id, False, None
+        # First try to find a single free table that can accommodate the group,
+        # taking the smallest one that fits in any room (best fit)
+        best_fit = None
+        for room, free_tables in self.free_by_room.items():
+            if group_size <= self.max_free_by_room[room]:
+                candidate = free_tables[bisect_left(free_tables, (group_size,))]
+                if best_fit is None or candidate[0] < best_fit[0]:
+                    best_fit = candidate
+        if best_fit:
+            return best_fit[1], False, None
         
-        # If no single table found, try to combine tables in the same room
-        # Group empty tables by room
-        empty_tables_by_room = {}
-        for table_id, table_info in self.tables.items():
-            # Skip tables that are already part of a combined table
-            if '+' in table_id or table_info.get('combined', False) or table_info['occupied']:
+        # If no single table found, try to combine free tables in the same room
+        for room in self.free_by_room:
+            if group_size > self.sum_free_by_room[room]:
+                continue
+            combined_tables = self._find_table_combination(room, group_size)
+            if not combined_tables:
                 continue
-                
-            room = table_info['room']
-            if room not in empty_tables_by_room:
-                empty_tables_by_room[room] = []
-            empty_tables_by_room[room].append((table_id, table_info['capacity']))
-        
-        # For each room, try to find a combination of tables that can accommodate the group
-        for room, empty_tables in empty_tables_by_room.items():
-            # Sort tables by capacity (largest first)
-            empty_tables.sort(key=lambda x: x[1], reverse=True)
             
-            # Try to find a combination of tables that can accommodate the group
-            for i in range(len(empty_tables)):
-                current_sum = 0
-                combined_tables = []
-                
-                for j in range(i, len(empty_tables)):
-                    table_id, capacity = empty_tables[j]
-                    current_sum += capacity
-                    combined_tables.append(table_id)
-                    
-                    if current_sum >= group_size:
-                        # Mark these tables as combined and occupied
-                        for table_id in combined_tables:
-                            self.tables[table_id]['combined'] = True
-                            self.tables[table_id]['occupied'] = True
-                        
-                        # Create a virtual combined table
-                        combined_id = "+".join(combined_tables)
-                        combined_capacity = current_sum
-                        self.tables[combined_id] = {
-                            'capacity': combined_capacity,
-                            'occupied': True,
-                            'combined': True,
-                            'component_tables': combined_tables,
-                            'room': room
-                        }
-                        
-                        # Track the combined table
-                        self.combined_tables[combined_id] = combined_tables
-                        
-                        # Add the group to the combined table
-                        self.assignments[combined_id] = []
-                        
-                        return combined_id, True, combined_tables
+            # Mark these tables as combined and occupied
+            tables = self.tables
+            combined_capacity = 0
+            for table_id in combined_tables:
+                table_info = tables[table_id]
+                table_info['combined'] = True
+                table_info['occupied'] = True
+                combined_capacity += table_info['capacity']
+                self.physical_table_ids.discard(table_id)
+                self._mark_table_in_use(table_id)
+            
+            # Create a virtual combined table
+            combined_id = self.next_combined_id
+            self.next_combined_id += 1
+            tables[combined_id] = {
+                'capacity': combined_capacity,
+                'occupied': True,
+                'combined': True,
+                'component_tables': combined_tables,
+                'room': room
+            }
+            
+            # Track the combined table
+            self.combined_tables[combined_id] = combined_tables
+            self._add_to_display_order(combined_id)
+            
+            # Add the group to the combined table
+            self.assignments[combined_id] = set()
+            
+            return combined_id, True, combined_tables
         
         return None, False, None
 
+    def _find_table_combination(self, room, group_size):
+        """Find the fewest free tables in a room that seat a group, wasting as few seats as possible"""
+        total_capacity = self.sum_free_by_room[room]
+        if total_capacity < group_size:
+            return None
+        
+        # Bounded knapsack over capacity classes: best[s] holds the smallest
+        # multiset of table capacities seating exactly s people
+        best = [None] * (total_capacity + 1)
+        best[0] = ()
+        for capacity, count in sorted(self.free_capacities_by_room[room].items(), reverse=True):
+            for _ in range(count):
+                for seats in range(total_capacity, capacity - 1, -1):
+                    previous = best[seats - capacity]
+                    if previous is not None and (best[seats] is None or len(previous) + 1 < len(best[seats])):
+                        best[seats] = previous + (capacity,)
+        
+        # Prefer fewer tables, then fewer empty seats
+        chosen = Counter(min(
+            (best[seats] for seats in range(group_size, total_capacity + 1) if best[seats] is not None),
+            key=len
+        ))
+        
+        # Pick actual free tables for each chosen capacity, largest first
+        free_tables = self.free_by_room[room]
+        combined_tables = []
+        for capacity, count in sorted(chosen.items(), reverse=True):
+            index = bisect_left(free_tables, (capacity,))
+            combined_tables.extend(table_id for _, table_id in free_tables[index:index + count])
+        return combined_tables
+
     def optimize_seating(self):
         """Optimize the seating arrangement for maximum efficiency"""
         # Create a copy of groups to avoid modification during iteration
@@ -205,6 +363,7 @@ class TablePlanner:
         # Sort groups by size (descending) for most efficient packing
         groups_to_seat.sort(key=lambda x: x[1]['size'], reverse=True)
         
+        tables = self.tables
         # Try to assign each group to a table
         for group_id, group_data in groups_to_seat:
             if group_id not in self.groups:  # Skip if already seated
@@ -213,13 +372,19 @@ class TablePlanner:
             group_size = group_data['size']
             group_name = group_data['name']
             
+            # Skip groups too large for even the emptiest room
+            if group_size > max(self.sum_free_by_room.values(), default=0):
+                continue
+            
             # Find the best table for this group
             table_id, is_combined, combined_tables = self.find_best_table_for_group(group_size, group_id)
             
             if table_id:
                 # Seat the group at the table
-                self.assignments[table_id].append(group_id)
-                self.tables[table_id]['occupied'] = True
+                self.assignments.setdefault(table_id, set()).add(group_id)
+                self.table_occupancy[table_id] += group_size
+                tables[table_id]['occupied'] = True
+                self._mark_table_in_use(table_id)
                 
                 # Move group from waiting to seated
                 self.seated_groups[group_id] = {
@@ -230,10 +395,11 @@ class TablePlanner:
                 
                 # Remove group from waiting list
                 del self.groups[group_id]
+                self._groups_dirty = True
                 
                 # Log if tables were combined
                 if is_combined:
-                    st.session_state.messages.append(f"Combined tables {combined_tables} in {self.tables[table_id]['room']} for {group_name}")
+                    st.session_state.messages.append(f"Combined tables {combined_tables} in {tables[table_id]['room']} for {group_name}")
 
     def get_table_utilization(self, table_id):
         """Get utilization percentage for a table"""
@@ -244,140 +410,135 @@ class TablePlanner:
         if capacity == 0:
             return 0
 
-        # Calculate occupancy for all assigned groups
-        occupancy = sum(
-            self.seated_groups[gid]['size'] for gid in self.assignments[table_id] 
-            if gid in self.seated_groups
-        )
+        occupancy = self.table_occupancy.get(table_id, 0)
         
         return (occupancy / capacity) * 100 if capacity > 0 else 0
 
     def get_overall_utilization(self):
         """Get overall utilization percentage for all tables"""
-        total_capacity = sum(table['capacity'] for table in self.tables.values())
-        if total_capacity == 0:
+        if self.total_capacity == 0:
             return 0
 
-        total_occupancy = 0
-        for table_id in self.tables:
-            # Calculate occupancy for all assigned groups
-            total_occupancy += sum(
-                self.seated_groups[gid]['size'] for gid in self.assignments[table_id] 
-                if gid in self.seated_groups
-            )
-        
-        return (total_occupancy / total_capacity) * 100 if total_capacity > 0 else 0
+        return (sum(self.table_occupancy.values()) / self.total_capacity) * 100
 
     def get_room_for_table(self, table_id):
         """Get the room for a given table"""
-        for room, tables in self.rooms.items():
-            if table_id in tables:
-                return room
-        return "Unknown"
+        return self.table_to_room.get(table_id, "Unknown")
+
+    def get_table_label(self, table_id):
+        """Get the display name for a table, naming combined tables after their components"""
+        if table_id in self.combined_tables:
+            return "+".join(self.combined_tables[table_id])
+        return table_id
 
     def get_table_status(self):
         """Get status of all tables for display"""
+        # Collect the seated group labels for each table in one pass, then join each table's list once
+        group_names_by_table = defaultdict(list)
+        for group_data in self.seated_groups.values():
+            group_names_by_table[group_data['table']].append(f"{group_data['name']}({group_data['size']})")
+        group_list_by_table = {table_id: ", ".join(names) for table_id, names in group_names_by_table.items()}
+        
+        tables = self.tables
+        occupancy_by_table = self.table_occupancy
         table_status = []
-        for table_id in sorted(self.tables.keys()):
-            capacity = self.tables[table_id]['capacity']
-            room = self.tables[table_id].get('room', 'Unknown')
-            groups = self.assignments[table_id]
-            
-            # Calculate occupancy for all assigned groups
-            occupancy = 0
-            group_names = []
-            for group_id in groups:
-                if group_id in self.seated_groups:
-                    occupancy += self.seated_groups[group_id]['size']
-                    group_names.append(f"{self.seated_groups[group_id]['name']}({self.seated_groups[group_id]['size']})")
-            
-            utilization = self.get_table_utilization(table_id)
+        for table_id, label in zip(self._sorted_table_ids, self._sorted_table_labels):
+            table_info = tables[table_id]
+            capacity = table_info['capacity']
+            occupancy = occupancy_by_table.get(table_id, 0)
+            utilization = (occupancy / capacity) * 100 if capacity else 0
             
             # Add indicator for combined tables
-            table_type = " (Combined)" if '+' in table_id or self.tables[table_id].get('combined', False) else ""
+            table_type = " (Combined)" if table_info['combined'] else ""
             
-            group_list = ", ".join(group_names)
-            status = f"Table {table_id}{table_type} ({room}, Capacity: {capacity}): {group_list} | Occupancy: {occupancy}/{capacity} ({utilization:.1f}%)"
-            table_status.append(status)
+            group_list = group_list_by_table.get(table_id, "")
+            table_status.append(
+                f"Table {label}{table_type} ({table_info['room']}, Capacity: {capacity}): "
+                f"{group_list} | Occupancy: {occupancy}/{capacity} ({utilization:.1f}%)"
+            )
         
         return table_status
     
+    def _refresh_group_views(self):
+        """Rebuild the cached group display lists if any group has changed"""
+        if not self._groups_dirty:
+            return
+        
+        self._waiting_groups_cache = [
+            f"{group_data['name']}: {group_data['size']} people" for group_data in self.groups.values()
+        ]
+        
+        # Waiting groups first, then seated groups
+        all_groups = [
+            {'id': group_id, 'name': group_data['name'], 'size': group_data['size'], 'status': 'Waiting', 'table': None}
+            for group_id, group_data in self.groups.items()
+        ]
+        all_groups += [
+            {'id': group_id, 'name': group_data['name'], 'size': group_data['size'], 'status': 'Seated', 'table': group_data['table']}
+            for group_id, group_data in self.seated_groups.items()
+        ]
+        self._all_groups_cache = all_groups
+        self._groups_dirty = False
+
     def get_waiting_groups(self):
         """Get waiting groups for display"""
-        waiting_groups = []
-        for group_id, group_data in self.groups.items():
-            waiting_groups.append(f"{group_data['name']}: {group_data['size']} people")
-        
-        return waiting_groups
+        self._refresh_group_views()
+        return self._waiting_groups_cache
     
     def rename_group(self, group_id, new_name):
         """Rename a group"""
         if group_id in self.groups:
             self.groups[group_id]['name'] = new_name
+            self._groups_dirty = True
             return True
         elif group_id in self.seated_groups:
             self.seated_groups[group_id]['name'] = new_name
+            self._groups_dirty = True
             return True
         return False
     
     def get_all_groups(self):
         """Get all groups (both waiting and seated) for display"""
-        all_groups = []
-        
-        # Add waiting groups
-        for group_id, group_data in self.groups.items():
-            all_groups.append({
-                'id': group_id,
-                'name': group_data['name'],
-                'size': group_data['size'],
-                'status': 'Waiting',
-                'table': None
-            })
-        
-        # Add seated groups
-        for group_id, group_data in self.seated_groups.items():
-            all_groups.append({
-                'id': group_id,
-                'name': group_data['name'],
-                'size': group_data['size'],
-                'status': 'Seated',
-                'table': group_data['table']
-            })
-        
-        return all_groups
+        self._refresh_group_views()
+        return self._all_groups_cache
 
 
 # Initialize the table planner in session state
 if 'planner' not in st.session_state:
-    st.session_state.planner = TablePlanner()
+    planner = TablePlanner()
     
     # Add default tables with room information
-    # GREENROOM
-    st.session_state.planner.add_table("T1A", 2, "GREENROOM")
-    st.session_state.planner.add_table("T1B", 2, "GREENROOM")
-    st.session_state.planner.add_table("T2", 4, "GREENROOM")
-    st.session_state.planner.add_table("T3A", 6, "GREENROOM")
-    st.session_state.planner.add_table("T3B", 4, "GREENROOM")
-
-    # RESTAURANT
-    st.session_state.planner.add_table("T4", 4, "RESTAURANT")
-    st.session_state.planner.add_table("T5", 4, "RESTEAUANT")
-    st.session_state.planner.add_table("T6", 4, "RESTAURANT")
-    st.session_state.planner.add_table("T7", 4, "RESTAURANT")
-    st.session_state.planner.add_table("T8", 4, "RESTAURANT")
-    st.session_state.planner.add_table("T9A", 2, "RESTAURANT")
-    st.session_state.planner.add_table("T9B", 2, "RESTAURANT")
-
-    # BOTTOM BAR
-    st.session_state.planner.add_table("WINDOW", 6, "BOTTOM BAR")
-    st.session_state.planner.add_table("BACK RIGHT", 2, "BOTTOM BAR")
-    st.session_state.planner.add_table("LADS", 4, "BOTTOM BAR")
-    st.session_state.planner.add_table("BLACKBOARD", 4, "BOTTOM BAR")
-    
-    # SMALL FUNCTION ROOM
-    st.session_state.planner.add_table("SQUARE", 2, "SMALL FUNCTION")
-    st.session_state.planner.add_table("OVAL", 6, "SMALL FUNCTION")
-    st.session_state.planner.add_table("WOODEN", 8, "SMALL FUNCTION")
+    planner.bulk_add_tables([
+        # GREENROOM
+        ("T1A", 2, "GREENROOM"),
+        ("T1B", 2, "GREENROOM"),
+        ("T2", 4, "GREENROOM"),
+        ("T3A", 6, "GREENROOM"),
+        ("T3B", 4, "GREENROOM"),
+
+        # RESTAURANT
+        ("T4", 4, "RESTAURANT"),
+        ("T5", 4, "RESTAURANT"),
+        ("T6", 4, "RESTAURANT"),
+        ("T7", 4, "RESTAURANT"),
+        ("T8", 4, "RESTAURANT"),
+        ("T9A", 2, "RESTAURANT"),
+        ("T9B", 2, "RESTAURANT"),
+
+        # BOTTOM BAR
+        ("WINDOW", 6, "BOTTOM BAR"),
+        ("BACK RIGHT", 2, "BOTTOM BAR"),
+        ("LADS", 4, "BOTTOM BAR"),
+        ("BLACKBOARD", 4, "BOTTOM BAR"),
+
+        # SMALL FUNCTION ROOM
+        ("SQUARE", 2, "SMALL FUNCTION"),
+        ("OVAL", 6, "SMALL FUNCTION"),
+        ("WOODEN", 8, "SMALL FUNCTION"),
+    ])
+    st.session_state.planner = planner
+
+planner = st.session_state.planner
 
 # Streamlit app layout
 st.title("🍻 Pub Table Planner")
@@ -385,13 +546,11 @@ st.markdown("---")
 
 # Initialize message log in session state
 if 'messages' not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = deque(maxlen=10)  # Keep only the last 10 messages
 
 # Function to add messages to log
 def log_message(message):
     st.session_state.messages.append(message)
-    if len(st.session_state.messages) > 10:  # Keep only the last 10 messages
-        st.session_state.messages.pop(0)
 
 # Create tabs for different functionalities
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["Dashboard", "Table Management", "Guest Management", "Manual Assignment", "Group Management"])
@@ -400,18 +559,18 @@ with tab1:
     st.header("Current Status")
     
     # Display overall utilization
-    utilization = st.session_state.planner.get_overall_utilization()
+    utilization = planner.get_overall_utilization()
     st.metric("Overall Utilization", f"{utilization:.1f}%")
     
     # Display table status
     st.subheader("Table Status")
-    table_status = st.session_state.planner.get_table_status()
+    table_status = planner.get_table_status()
     for status in table_status:
         st.text(status)
     
     # Display waiting groups
     st.subheader("Waiting Groups")
-    waiting_groups = st.session_state.planner.get_waiting_groups()
+    waiting_groups = planner.get_waiting_groups()
     if waiting_groups:
         for group in waiting_groups:
             st.text(group)
@@ -420,7 +579,7 @@ with tab1:
     
     # Optimize button
     if st.button("Optimize Seating", use_container_width=True):
-        st.session_state.planner.optimize_seating()
+        planner.optimize_seating()
         log_message("Optimized seating arrangement for maximum efficiency")
         st.rerun()
 
@@ -433,11 +592,11 @@ with tab2:
         st.subheader("Add Table")
         table_id = st.text_input("Table ID", key="add_table_id")
         capacity = st.number_input("Capacity", min_value=1, value=4, key="add_capacity")
-        room = st.selectbox("Room", options=["GREENROOM", "RESTAURANT", "BOTTOM BAR", "SMALL FUNCTION"], key="add_room")
+        room = st.selectbox("Room", options=list(planner.rooms), key="add_room")
         if st.button("Add Table"):
             if table_id:
-                if table_id not in st.session_state.planner.tables:
-                    st.session_state.planner.add_table(table_id, capacity, room)
+                if table_id not in planner.tables:
+                    planner.add_table(table_id, capacity, room)
                     log_message(f"Added table {table_id} with capacity {capacity} to {room}")
                     st.rerun()
                 else:
@@ -449,13 +608,15 @@ with tab2:
         st.subheader("Remove Table")
         remove_table_id = st.selectbox(
             "Select Table to Remove",
-            options=list(st.session_state.planner.tables.keys()),
+            options=list(planner.tables.keys()),
+            format_func=planner.get_table_label,
             key="remove_table_select"
         )
         if st.button("Remove Table", type="primary"):
-            if remove_table_id in st.session_state.planner.tables:
-                st.session_state.planner.remove_table(remove_table_id)
-                log_message(f"Removed table {remove_table_id}")
+            if remove_table_id in planner.tables:
+                remove_table_label = planner.get_table_label(remove_table_id)
+                planner.remove_table(remove_table_id)
+                log_message(f"Removed table {remove_table_label}")
                 st.rerun()
             else:
                 st.error(f"Table {remove_table_id} does not exist")
@@ -467,7 +628,7 @@ with tab3:
     group_name = st.text_input("Group Name (optional)", key="group_name")
     group_size = st.number_input("Group Size", min_value=1, value=2, key="group_size")
     if st.button("Add Group"):
-        group_id = st.session_state.planner.add_guests(group_size, group_name)
+        group_id = planner.add_guests(group_size, group_name)
         if group_name:
             log_message(f"Added {group_name} with {group_size} people")
         else:
@@ -477,10 +638,10 @@ with tab3:
 with tab4:
     st.header("Manual Assignment")
     
-    if st.session_state.planner.groups:
+    if planner.groups:
         group_options = {
             f"{group_data['name']} ({group_data['size']} people)": gid 
-            for gid, group_data in st.session_state.planner.groups.items()
+            for gid, group_data in planner.groups.items()
         }
         selected_group_label = st.selectbox("Select Group", options=list(group_options.keys()))
         selected_group_id = group_options[selected_group_label]
@@ -489,11 +650,11 @@ with tab4:
         selected_group_id = None
     
     # Only show regular tables (not combined ones) for manual assignment
-    table_options = [tid for tid in st.session_state.planner.tables.keys() if '+' not in tid and not st.session_state.planner.tables[tid].get('combined', False)]
+    table_options = sorted(planner.physical_table_ids)
     selected_table = st.selectbox("Select Table", options=table_options)
     
     if st.button("Assign Group to Table") and selected_group_id is not None:
-        success, message = st.session_state.planner.seat_guests(selected_group_id, selected_table)
+        success, message = planner.seat_guests(selected_group_id, selected_table)
         log_message(message)
         st.rerun()
 
@@ -504,7 +665,7 @@ with tab5:
     st.subheader("All Groups")
     
     # Get all groups
-    all_groups = st.session_state.planner.get_all_groups()
+    all_groups = planner.get_all_groups()
     
     if all_groups:
         # Display groups in a table format
@@ -518,7 +679,7 @@ with tab5:
                 st.text(group['status'])
             with col4:
                 if group['table']:
-                    st.text(f"Table {group['table']}")
+                    st.text(f"Table {planner.get_table_label(group['table'])}")
                 else:
                     st.text("")
                 
@@ -529,14 +690,14 @@ with tab5:
                 new_name = st.text_input("Rename", value=group['name'], key=f"rename_{group['id']}")
             with col6:
                 if st.button("Rename", key=f"rename_btn_{group['id']}"):
-                    if st.session_state.planner.rename_group(group['id'], new_name):
+                    if planner.rename_group(group['id'], new_name):
                         log_message(f"Renamed group to {new_name}")
                         st.rerun()
             with col7:
                 # Mark as left button for seated groups
                 if group['status'] == 'Seated':
                     if st.button("Mark Left", key=f"left_{group['id']}"):
-                        success, message = st.session_state.planner.mark_group_left(group['id'])
+                        success, message = planner.mark_group_left(group['id'])
                         log_message(message)
                         st.rerun()
     else: